@@ -66,3 +66,133 @@ def test_response_headers_should_have_correct_values():
 
     assert response.headers.get('content-length') == "10806"
     assert response.headers.get('date') == "Fri, 24 Oct 2014 18:35:37 GMT"
+
+
+def test_response_info_and_getheaders_reuse_parsed_headers():
+    recorded_response = {
+        "status": {
+            "message": "OK",
+            "code": 200
+        },
+        "headers": {
+            "content-length": ["0"],
+            "set-cookie": ["a=1", "b=2"],
+        },
+        "body": {
+            "string": b""
+        }
+    }
+    response = VCRHTTPResponse(recorded_response)
+
+    assert response.info() is response.headers
+    assert sorted(response.getheaders()) == [
+        ("content-length", "0"),
+        ("set-cookie", "a=1"),
+        ("set-cookie", "b=2"),
+    ]
+    assert response.getheader("Set-Cookie") == "a=1, b=2"
+    assert response.getheader("x-missing", "default") == "default"
+
+
+def test_response_read_and_readline_advance_through_body():
+    recorded_response = {
+        "status": {
+            "message": "OK",
+            "code": 200
+        },
+        "headers": {},
+        "body": {
+            "string": b"first\nsecond\nthird"
+        }
+    }
+    response = VCRHTTPResponse(recorded_response)
+
+    assert response.readline() == b"first\n"
+    assert response.read(3) == b"sec"
+    assert response.readline(2) == b"on"
+    assert response.readline() == b"d\n"
+    assert response.read() == b"third"
+    assert response.read() == b""
+    assert response.readline() == b""
+
+
+def test_response_parses_headers_lazily():
+    recorded_response = {
+        "status": {
+            "message": "OK",
+            "code": 200
+        },
+        "headers": {
+            "content-length": ["5"],
+        },
+        "body": {
+            "string": b"hello"
+        }
+    }
+    response = VCRHTTPResponse(recorded_response)
+
+    assert response._message is None
+    assert response.read() == b"hello"
+    assert response._message is None
+    assert response.headers.get('content-length') == "5"
+    assert response.msg is response.headers
+
+
+def test_response_info_survives_msg_being_replaced():
+    recorded_response = {
+        "status": {
+            "message": "OK",
+            "code": 200
+        },
+        "headers": {
+            "content-length": ["0"],
+        },
+        "body": {
+            "string": b""
+        }
+    }
+    response = VCRHTTPResponse(recorded_response)
+    # urllib replaces the response's msg with its reason phrase
+    response.msg = response.reason
+
+    assert response.msg == "OK"
+    assert response.info().get('content-length') == "0"
+
+
+def test_response_headers_can_be_assigned_none():
+    recorded_response = {
+        "status": {
+            "message": "OK",
+            "code": 200
+        },
+        "headers": {
+            "content-length": ["0"],
+        },
+        "body": {
+            "string": b""
+        }
+    }
+    response = VCRHTTPResponse(recorded_response)
+    response.msg = None
+    response.headers = None
+
+    assert response.msg is None
+    assert response.headers is None
+    assert response.info().get('content-length') == "0"
+
+
+def test_response_with_none_body_reads_as_empty():
+    recorded_response = {
+        "status": {
+            "message": "OK",
+            "code": 200
+        },
+        "headers": {},
+        "body": {
+            "string": None
+        }
+    }
+    response = VCRHTTPResponse(recorded_response)
+
+    assert response.readline() == b""
+    assert response.read() == b""
@@ -1,6 +1,11 @@
-from vcr.stubs import VCRHTTPSConnection
+import pytest
+
+from vcr.stubs import VCRHTTPSConnection, parse_headers
+from vcr.stubs import compat
 from vcr.compat import mock
 from vcr.cassette import Cassette
+from vcr.errors import CannotOverwriteExistingCassetteException
+from vcr.request import Request
 
 
 class TestVCRConnection(object):
@@ -10,9 +15,75 @@ class TestVCRConnection(object):
         vcr_connection.ssl_version = 'example_ssl_version'
         assert vcr_connection.real_connection.ssl_version == 'example_ssl_version'
 
+    def test_vcr_attributes_are_not_propagated_to_real_connection(self):
+        vcr_connection = VCRHTTPSConnection('www.examplehost.com')
+        vcr_connection.putrequest('GET', '/')
+        assert '_vcr_request' not in vars(vcr_connection.real_connection)
+
     @mock.patch('vcr.cassette.Cassette.can_play_response_for', return_value=False)
     def testing_connect(*args):
         vcr_connection = VCRHTTPSConnection('www.google.com')
         vcr_connection.cassette = Cassette('test', record_mode='all')
         vcr_connection.real_connection.connect()
         assert vcr_connection.real_connection.sock is not None
+
+    def test_send_accumulates_body_chunks(self):
+        vcr_connection = VCRHTTPSConnection('www.examplehost.com')
+        vcr_connection.putrequest('POST', '/upload')
+        for chunk in (b'abc', b'def', u'ghi'):
+            vcr_connection.send(chunk)
+        vcr_connection._finalize_body()
+        assert vcr_connection._vcr_request.body == b'abcdefghi'
+        assert isinstance(vcr_connection._vcr_request.body, bytes)
+
+    def test_getresponse_rechecks_cassette_after_connect(self):
+        cassette = Cassette('test', record_mode='none')
+        cassette.rewound = True
+        cassette.append(
+            Request('GET', 'https://www.examplehost.com/', '', {}),
+            {
+                'status': {'code': 200, 'message': 'OK'},
+                'headers': {},
+                'body': {'string': b''},
+            },
+        )
+        first = VCRHTTPSConnection('www.examplehost.com')
+        second = VCRHTTPSConnection('www.examplehost.com')
+        first.cassette = second.cassette = cassette
+
+        first.request('GET', '/')
+        first.connect()
+        second.request('GET', '/')
+        assert second.getresponse().status == 200
+
+        # The only matching interaction was played by the second connection
+        with pytest.raises(CannotOverwriteExistingCassetteException):
+            first.getresponse()
+
+    def test_uri_follows_host_and_port_changes(self):
+        vcr_connection = VCRHTTPSConnection('www.examplehost.com')
+        assert vcr_connection._uri('/path') == 'https://www.examplehost.com/path'
+        vcr_connection.host = 'other.examplehost.com'
+        vcr_connection.port = 8443
+        uri = vcr_connection._uri('/path')
+        assert uri == 'https://other.examplehost.com:8443/path'
+        assert vcr_connection._url(uri) == '/path'
+
+
+def test_parse_headers_matches_parsing_serialized_headers():
+    header_list = {
+        'Content-Type': ['text/html; charset=utf-8'],
+        'Set-Cookie': ['a=1; Path=/', 'b=2; Path=/'],
+        'X-Unicode': [u'caf\xe9'],
+        'X-Padded': ['  value'],
+    }
+    serialized = b''.join(
+        key.encode('utf-8') + b':' + value.encode('utf-8') + b'\r\n'
+        for key, values in header_list.items()
+        for value in values
+    )
+    expected = compat.get_httpmessage(serialized)
+
+    message = parse_headers(header_list)
+
+    assert sorted(message.items()) == sorted(expected.items())
@@ -3,6 +3,8 @@ from six import BytesIO, text_type
 from six.moves.urllib.parse import urlparse, parse_qsl
 from .util import CaseInsensitiveDict
 
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
 
 class Request(object):
     """
@@ -58,7 +60,7 @@ class Request(object):
         parse_uri = urlparse(self.uri)
         port = parse_uri.port
         if port is None:
-            port = {'https': 443, 'http': 80}[parse_uri.scheme]
+            port = _DEFAULT_PORTS[parse_uri.scheme]
         return port
 
     @property
@@ -123,9 +125,12 @@ class HeadersDict(CaseInsensitiveDict):
         if isinstance(value, (tuple, list)):
             value = value[0]
 
-        # Preserve the case from the first time this key was set.
-        old = self._store.get(key.lower())
+        # Preserve the case from the first time this key was set.  The
+        # lowercased key is computed once and used for both the lookup and
+        # the store, rather than going through CaseInsensitiveDict again.
+        lower_key = key.lower()
+        old = self._store.get(lower_key)
         if old:
             key = old[0]
 
-        super(HeadersDict, self).__setitem__(key, value)
+        self._store[lower_key] = (key, value)
@@ -7,7 +7,6 @@ from six.moves.http_client import (
     HTTPSConnection,
     HTTPResponse,
 )
-from six import BytesIO
 from vcr.request import Request
 from vcr.errors import CannotOverwriteExistingCassetteException
 from . import compat
@@ -42,22 +41,22 @@ def parse_headers(header_list):
     Convert headers from our serialized dict with lists for keys to a
     HTTPMessage
     """
-    header_string = b""
-    for key, values in header_list.items():
-        for v in values:
-            header_string += \
-                key.encode('utf-8') + b":" + v.encode('utf-8') + b"\r\n"
-    return compat.get_httpmessage(header_string)
+    return compat.build_httpmessage(header_list)
 
 
 def serialize_headers(response):
     out = {}
+    setdefault = out.setdefault
     for key, values in compat.get_headers(response.msg):
-        out.setdefault(key, [])
-        out[key].extend(values)
+        setdefault(key, []).extend(values)
     return out
 
 
+# Placeholder for lazily computed VCRHTTPResponse attributes that have not
+# been computed or assigned yet; None is a valid assigned value.
+_NOT_PARSED = object()
+
+
 class VCRHTTPResponse(HTTPResponse):
     """
     Stub reponse class that gets returned instead of a HTTPResponse
@@ -67,7 +66,10 @@ class VCRHTTPResponse(HTTPResponse):
         self.reason = recorded_response['status']['message']
         self.status = self.code = recorded_response['status']['code']
         self.version = None
-        self._content = BytesIO(self.recorded_response['body']['string'])
+        # A recorded body may be None (see convert_body_to_bytes), which
+        # reads back as an empty body.
+        self._body = self.recorded_response['body']['string'] or b''
+        self._position = 0
         self._closed = False
 
         headers = self.recorded_response['headers']
@@ -76,12 +78,69 @@ class VCRHTTPResponse(HTTPResponse):
         # libraries trying to process a chunked response.  By removing the
         # transfer-encoding: chunked header, this should cause the downstream
         # libraries to process this as a non-chunked response.
-        te_key = [h for h in headers.keys() if h.upper() == 'TRANSFER-ENCODING']
-        if te_key:
-            del headers[te_key[0]]
-        self.headers = self.msg = parse_headers(headers)
+        te_key = next(
+            (h for h in headers if h.lower() == 'transfer-encoding'), None
+        )
+        if te_key is not None:
+            del headers[te_key]
+
+        # Parsing the headers is deferred until something asks for them, as
+        # many callers only ever read() the body.
+        self._raw_headers = headers
+        self._message = None
+        self._headers_list = None
+        self._msg = _NOT_PARSED
+        self._headers = _NOT_PARSED
+        self._length = _NOT_PARSED
+
+    def _get_message(self):
+        """
+        Parse the headers on first use.  Our own reference to the message is
+        kept separately from self.msg, which urllib overwrites with the
+        reason phrase after the fact.
+        """
+        if self._message is None:
+            self._message = parse_headers(self._raw_headers)
+        return self._message
+
+    def _get_headers_list(self):
+        if self._headers_list is None:
+            self._headers_list = list(
+                compat.get_header_items(self._get_message())
+            )
+        return self._headers_list
+
+    @property
+    def msg(self):
+        if self._msg is _NOT_PARSED:
+            return self._get_message()
+        return self._msg
+
+    @msg.setter
+    def msg(self, value):
+        self._msg = value
+
+    @property
+    def headers(self):
+        if self._headers is _NOT_PARSED:
+            return self._get_message()
+        return self._headers
 
-        self.length = compat.get_header(self.msg, 'content-length') or None
+    @headers.setter
+    def headers(self, value):
+        self._headers = value
+
+    @property
+    def length(self):
+        if self._length is _NOT_PARSED:
+            self._length = compat.get_header(
+                self._get_message(), 'content-length'
+            ) or None
+        return self._length
+
+    @length.setter
+    def length(self, value):
+        self._length = value
 
     @property
     def closed(self):
@@ -90,11 +149,27 @@ class VCRHTTPResponse(HTTPResponse):
         # self.closed from the superclas
         return self._closed
 
-    def read(self, *args, **kwargs):
-        return self._content.read(*args, **kwargs)
-
-    def readline(self, *args, **kwargs):
-        return self._content.readline(*args, **kwargs)
+    def read(self, amt=None):
+        """
+        Read from the recorded body by slicing it at a cursor, so nothing is
+        copied into an intermediate buffer.  A full read at the start of the
+        body returns the recorded bytes object itself.
+        """
+        start = self._position
+        end = len(self._body)
+        if amt is not None and amt >= 0:
+            end = min(start + amt, end)
+        self._position = end
+        return self._body[start:end]
+
+    def readline(self, limit=-1):
+        start = self._position
+        newline = self._body.find(b'\n', start)
+        end = len(self._body) if newline == -1 else newline + 1
+        if limit is not None and limit >= 0:
+            end = min(start + limit, end)
+        self._position = end
+        return self._body[start:end]
 
     def close(self):
         self._closed = True
@@ -107,14 +182,17 @@ class VCRHTTPResponse(HTTPResponse):
         return self.closed
 
     def info(self):
-        return parse_headers(self.recorded_response['headers'])
+        return self._get_message()
 
     def getheaders(self):
-        message = parse_headers(self.recorded_response['headers'])
-        return list(compat.get_header_items(message))
+        return list(self._get_headers_list())
 
     def getheader(self, header, default=None):
-        values = [v for (k, v) in self.getheaders() if k.lower() == header.lower()]
+        target = header.lower()
+        values = [
+            v for (k, v) in self._get_headers_list()
+            if k == target or k.lower() == target
+        ]
 
         if values:
             return ', '.join(values)
@@ -122,6 +200,13 @@ class VCRHTTPResponse(HTTPResponse):
             return default
 
 
+# Attributes VCRConnection sets for its own use, which are never propagated
+# to the real connection.
+_VCR_CONNECTION_ATTRIBUTES = frozenset(
+    ('real_connection', '_vcr_request', '_uri_prefix')
+)
+
+
 class VCRConnection(object):
     # A reference to the cassette that's currently being patched in
     cassette = None
@@ -131,26 +216,29 @@ class VCRConnection(object):
         Returns empty string for the default port and ':port' otherwise
         """
         port = self.real_connection.port
-        default_port = {'https': 443, 'http': 80}[self._protocol]
-        return ':{}'.format(port) if port != default_port else ''
+        return ':{}'.format(port) if port != self._default_port else ''
 
-    def _uri(self, url):
-        """Returns request absolute URI"""
-        uri = "{}://{}{}{}".format(
+    def _update_uri_prefix(self):
+        """
+        Cache the '{protocol}://{host}{port postfix}' prefix shared by every
+        request made on this connection.  It only changes when the host or
+        port does.
+        """
+        self._uri_prefix = "{}://{}{}".format(
             self._protocol,
             self.real_connection.host,
             self._port_postfix(),
-            url,
         )
-        return uri
+
+    def _uri(self, url):
+        """Returns request absolute URI"""
+        return self._uri_prefix + url
 
     def _url(self, uri):
         """Returns request selector url from absolute URI"""
-        prefix = "{}://{}{}".format(
-            self._protocol,
-            self.real_connection.host,
-            self._port_postfix(),
-        )
+        prefix = self._uri_prefix
+        if uri.startswith(prefix):
+            return uri[len(prefix):]
         return uri.replace(prefix, '', 1)
 
     def request(self, method, url, body=None, headers=None, *args, **kwargs):
@@ -177,7 +265,7 @@ class VCRConnection(object):
         self._vcr_request = Request(
             method=method,
             uri=self._uri(url),
-            body="",
+            body=bytearray(),
             headers={}
         )
         log.debug('Got {}'.format(self._vcr_request))
@@ -190,9 +278,16 @@ class VCRConnection(object):
         This method is called after request(), to add additional data to the
         body of the request.  So if that happens, let's just append the data
         onto the most recent request in the cassette.
+
+        The body is accumulated in a bytearray so that streaming a body in
+        many small chunks doesn't copy the whole buffer on every call.
         '''
-        self._vcr_request.body = self._vcr_request.body + data \
-            if self._vcr_request.body else data
+        if isinstance(data, six.text_type):
+            data = data.encode('utf-8')
+        body = self._vcr_request.body
+        if not isinstance(body, bytearray):
+            body = self._vcr_request.body = bytearray(body or b'')
+        body.extend(data)
 
     def close(self):
         # Note: the real connection will only close if it's open, so
@@ -208,11 +303,30 @@ class VCRConnection(object):
         if message_body is not None:
             self._vcr_request.body = message_body
 
+    def _finalize_body(self):
+        """
+        Freeze a body accumulated by send() into immutable bytes
+        before the request is matched against the cassette or sent.
+        """
+        if isinstance(self._vcr_request.body, bytearray):
+            self._vcr_request.body = bytes(self._vcr_request.body)
+
+    def _can_play_response(self):
+        """
+        Whether the cassette can play a response for the current request.
+
+        This is checked afresh on every call: the answer depends on the
+        cassette's play counts, which other connections sharing the cassette
+        change.
+        """
+        self._finalize_body()
+        return self.cassette.can_play_response_for(self._vcr_request)
+
     def getresponse(self, _=False, **kwargs):
         '''Retrieve the response'''
         # Check to see if the cassette has a response for this request. If so,
         # then return it
-        if self.cassette.can_play_response_for(self._vcr_request):
+        if self._can_play_response():
             log.info(
                 "Playing response for {} from cassette".format(
                     self._vcr_request
@@ -277,8 +391,7 @@ class VCRConnection(object):
         and are not write-protected.
         """
 
-        if hasattr(self, '_vcr_request') and \
-                self.cassette.can_play_response_for(self._vcr_request):
+        if hasattr(self, '_vcr_request') and self._can_play_response():
             # We already have a response we are going to play, don't
             # actually connect
             return
@@ -312,6 +425,7 @@ class VCRConnection(object):
         from vcr.patch import force_reset
         with force_reset():
             self.real_connection = self._baseclass(*args, **kwargs)
+        self._update_uri_prefix()
 
     def __setattr__(self, name, value):
         """
@@ -322,18 +436,25 @@ class VCRConnection(object):
         such as 'ssl_version'. These attributes need to get set on the real
         connection to have the correct and expected behavior.
 
+        VCR's own bookkeeping attributes are kept local, since the real
+        connection has no use for them.
+
         TODO: Separately setting the attribute on the two instances is not
         ideal. We should switch to a proxying implementation.
         """
-        try:
-            setattr(self.real_connection, name, value)
-        except AttributeError:
-            # raised if real_connection has not been set yet, such as when
-            # we're setting the real_connection itself for the first time
-            pass
+        if name not in _VCR_CONNECTION_ATTRIBUTES:
+            # real_connection may not have been set yet, such as when a
+            # subclass sets attributes before calling our __init__.  Look it
+            # up directly rather than letting __getattr__ raise.
+            real_connection = self.__dict__.get('real_connection')
+            if real_connection is not None:
+                setattr(real_connection, name, value)
 
         super(VCRConnection, self).__setattr__(name, value)
 
+        if name in ('host', 'port') and 'real_connection' in self.__dict__:
+            self._update_uri_prefix()
+
     def __getattr__(self, name):
         """
         Send requests for weird attributes up to the real connection
@@ -356,10 +477,12 @@ class VCRHTTPConnection(VCRConnection):
     '''A Mocked class for HTTP requests'''
     _baseclass = HTTPConnection
     _protocol = 'http'
+    _default_port = 80
 
 
 class VCRHTTPSConnection(VCRConnection):
     '''A Mocked class for HTTPS requests'''
     _baseclass = HTTPSConnection
     _protocol = 'https'
+    _default_port = 443
     is_verified = True
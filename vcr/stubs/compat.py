@@ -1,5 +1,5 @@
 import six
-from six import BytesIO
+from io import BytesIO
 from six.moves.http_client import HTTPMessage
 try:
     import http.client
@@ -10,14 +10,10 @@ except ImportError:
 """
 The python3 http.client api moved some stuff around, so this is an abstraction
 layer that tries to cope with this move.
-"""
-
 
-def get_header(message, name):
-    if six.PY3:
-        return message.getallmatchingheaders(name)
-    else:
-        return message.getheader(name)
+The version check is made once at import time rather than on every call,
+since these helpers run for every header of every response.
+"""
 
 
 def get_header_items(message):
@@ -26,18 +22,54 @@ def get_header_items(message):
             yield key, value
 
 
-def get_headers(message):
-    for key in set(message.keys()):
-        if six.PY3:
-            yield key, message.get_all(key)
-        else:
-            yield key, message.getheaders(key)
+if six.PY3:
+    def get_header(message, name):
+        return message.getallmatchingheaders(name)
 
+    def get_headers(message):
+        get_all = message.get_all
+        for key in set(message.keys()):
+            yield key, get_all(key)
 
-def get_httpmessage(headers):
-    if six.PY3:
+    def get_httpmessage(headers):
         return http.client.parse_headers(BytesIO(headers))
-    msg = HTTPMessage(BytesIO(headers))
-    msg.fp.seek(0)
-    msg.readheaders()
-    return msg
+
+    def build_httpmessage(header_list):
+        """
+        Build an HTTPMessage straight from a dict of header lists, rather
+        than encoding the headers and parsing them back.  Values are treated
+        the way http.client.parse_headers would treat them: the UTF-8 bytes
+        are read back as latin-1 and leading whitespace is dropped.
+        """
+        msg = http.client.HTTPMessage()
+        add_header = msg.__setitem__
+        for key, values in header_list.items():
+            for v in values:
+                add_header(key, v.encode('utf-8').decode('iso-8859-1').lstrip(' \t'))
+        msg.set_payload('')
+        return msg
+else:
+    def get_header(message, name):
+        return message.getheader(name)
+
+    def get_headers(message):
+        for key in set(message.keys()):
+            yield key, message.getheaders(key)
+
+    def get_httpmessage(headers):
+        msg = HTTPMessage(BytesIO(headers))
+        msg.fp.seek(0)
+        msg.readheaders()
+        return msg
+
+    def build_httpmessage(header_list):
+        parts = []
+        append = parts.append
+        for key, values in header_list.items():
+            encoded_key = key.encode('utf-8')
+            for v in values:
+                append(encoded_key)
+                append(b":")
+                append(v.encode('utf-8'))
+                append(b"\r\n")
+        return get_httpmessage(b"".join(parts))